@@ -7,8 +7,30 @@ Verifies if authentication completed and tunnel is running
 import subprocess
 import json
 import os
+import time
 from pathlib import Path
 
+PROBE_TIMEOUT = 10  # seconds
+
+def _start_probe(code_path, args):
+    """Start a read-only `code tunnel ...` command without waiting for it"""
+    return subprocess.Popen(
+        [str(code_path), "tunnel", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+def _collect_probe(process, deadline):
+    """Wait for a probe from _start_probe; kill it if it overruns the deadline"""
+    try:
+        stdout, stderr = process.communicate(timeout=max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
 def check_tunnel_status():
     """Check current tunnel status"""
     print("🔍 Checking VSCode Tunnel Status...")
@@ -21,16 +43,26 @@ def check_tunnel_status():
     
     print(f"📂 Code path: {code_path}")
     
+    # The auth and status probes don't depend on each other; start both
+    # now so the CLI start-up cost of the two overlaps
+    auth_probe = None
+    try:
+        auth_probe = _start_probe(code_path, ["user", "show"])
+        status_probe = _start_probe(code_path, ["status"])
+    except OSError as e:
+        if auth_probe is not None:
+            auth_probe.kill()
+            auth_probe.communicate()
+        print(f"❌ Error running VSCode CLI: {e}")
+        return False
+    # Both probes run concurrently, so they share one deadline; otherwise the
+    # status probe's clock would only start once the auth checks finished
+    deadline = time.monotonic() + PROBE_TIMEOUT
+    
     # Check if user is logged in
     print("\n1️⃣ Checking authentication status...")
     try:
-        result = subprocess.run(
-            f'"{code_path}" tunnel user show',
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _collect_probe(auth_probe, deadline)
         
         if result.returncode == 0:
             print("✅ User authenticated successfully!")
@@ -59,13 +91,7 @@ def check_tunnel_status():
     # Check running tunnels
     print("\n2️⃣ Checking active tunnels...")
     try:
-        result = subprocess.run(
-            f'"{code_path}" tunnel status',
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _collect_probe(status_probe, deadline)
         
         if result.returncode == 0:
             print("✅ Tunnel status retrieved:")
@@ -5,27 +5,86 @@ Complete Tunnel Setup - Two-step authentication process
 2. Start the tunnel automatically
 """
 
+import os
+import re
 import subprocess
 import time
 import json
+import functools
 from pathlib import Path
 
+# Where the VSCode CLI keeps its state; the login token lands here once
+# GitHub authentication completes
+CLI_STATE_DIRS = [
+    Path.home() / ".vscode" / "cli",
+    Path.home() / ".config" / "code-tunnel",
+]
+
+AUTH_TIMEOUT = 300       # seconds
+AUTH_RECHECK = 30        # run `code tunnel user show` at least this often
+STATE_POLL_INTERVAL = 0.5
+
+TUNNEL_URL_RE = re.compile(rb"https://vscode\.dev/tunnel/\S+")
+TUNNEL_URL_TIMEOUT = 5     # seconds
+TUNNEL_LOG_TAIL = 8192     # bytes
+
+CODE_PATH = str(Path.home() / ".local" / "bin" / "code")
+INSTALLER_CONFIG_FILE = Path.home() / ".config" / "vscode-server-installer" / "config.json"
+
+@functools.lru_cache(maxsize=4)
+def _parse_config(path, mtime_ns):
+    """Parse a JSON config file; cached per (path, mtime) so edits are picked up."""
+    return json.loads(Path(path).read_bytes())
+
+def load_installer_config():
+    """Return the VSCode Server installer config ({} if missing or unreadable)."""
+    try:
+        mtime_ns = INSTALLER_CONFIG_FILE.stat().st_mtime_ns
+        return _parse_config(str(INSTALLER_CONFIG_FILE), mtime_ns)
+    except (OSError, ValueError):
+        return {}
+
+def _cli_state_signature():
+    """Cheap fingerprint of the CLI state dirs (names + mtimes, no subprocess)."""
+    signature = []
+    for state_dir in CLI_STATE_DIRS:
+        try:
+            with os.scandir(state_dir) as entries:
+                for entry in entries:
+                    try:
+                        signature.append((entry.path, entry.stat().st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return frozenset(signature)
+
 def wait_for_authentication():
     """Wait for user to complete GitHub authentication"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     print("⏳ Waiting for GitHub authentication to complete...")
     print("👉 Please complete authentication at: https://github.com/login/device")
-    print("🔄 Checking authentication status every 5 seconds...")
+    print("🔄 Watching for the login to complete...")
     
-    max_attempts = 60  # 5 minutes max
+    # `code tunnel user show` starts the whole CLI, so it only runs when the
+    # CLI state dir changes (or every AUTH_RECHECK seconds as a fallback);
+    # in between we just stat the directory
+    deadline = time.monotonic() + AUTH_TIMEOUT
+    attempt = 0
+    last_signature = None
+    next_check = 0.0
     
-    for attempt in range(max_attempts):
+    while time.monotonic() < deadline:
+        signature = _cli_state_signature()
+        if signature == last_signature and time.monotonic() < next_check:
+            time.sleep(STATE_POLL_INTERVAL)
+            continue
+        next_check = time.monotonic() + AUTH_RECHECK
+        attempt += 1
+        
         try:
             # Check if user is authenticated
             result = subprocess.run(
-                f'"{code_path}" tunnel user show',
-                shell=True,
+                [CODE_PATH, "tunnel", "user", "show"],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -36,31 +95,39 @@ def wait_for_authentication():
                 print(f"👤 User info: {result.stdout.strip()}")
                 return True
             else:
-                print(f"⏳ Attempt {attempt + 1}/{max_attempts} - Not authenticated yet...")
-                time.sleep(5)
+                print(f"⏳ Check {attempt} - Not authenticated yet...")
                 
         except Exception as e:
-            print(f"⚠️  Error checking auth (attempt {attempt + 1}): {e}")
-            time.sleep(5)
+            print(f"⚠️  Error checking auth (check {attempt}): {e}")
+        
+        # Fingerprint after the probe: the CLI writes its own logs/state
+        # while it runs, which must not count as a change next time round
+        last_signature = _cli_state_signature()
     
     print("❌ Authentication timeout - please try manual authentication")
     return False
 
+def wait_for_tunnel_url(log_path, offset, process, timeout=TUNNEL_URL_TIMEOUT):
+    """Watch the tunnel log for its vscode.dev link; only output after offset counts"""
+    deadline = time.monotonic() + timeout
+    with open(log_path, "rb") as f:
+        while True:
+            exited = process.poll() is not None
+            size = os.fstat(f.fileno()).st_size
+            if size > offset:
+                # The link is printed near the end; don't rescan a large log
+                f.seek(max(offset, size - TUNNEL_LOG_TAIL))
+                match = TUNNEL_URL_RE.search(f.read())
+                if match:
+                    return match.group().decode(errors="replace")
+            if exited or time.monotonic() >= deadline:
+                return None
+            time.sleep(0.2)
+
 def start_tunnel():
     """Start the tunnel after authentication is complete"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     # Get tunnel name from config
-    config_file = Path.home() / ".config" / "vscode-server-installer" / "config.json"
-    tunnel_name = "my-dev-tunnel"  # default
-    
-    if config_file.exists():
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                tunnel_name = config.get('tunnel_name', tunnel_name)
-        except:
-            pass
+    tunnel_name = load_installer_config().get('tunnel_name', "my-dev-tunnel")
     
     if not tunnel_name:
         tunnel_name = input("📝 Enter tunnel name: ").strip()
@@ -71,32 +138,33 @@ def start_tunnel():
     
     try:
         # Start tunnel in background
-        command = f'"{code_path}" tunnel --name "{tunnel_name}" --accept-server-license-terms'
-        print(f"▶️  Command: {command}")
-        
-        # Use nohup to run in background
-        bg_command = f"nohup {command} > tunnel_output.log 2>&1 &"
+        command = [CODE_PATH, "tunnel", "--name", tunnel_name, "--accept-server-license-terms"]
+        print(f"▶️  Command: {' '.join(command)}")
         
-        result = subprocess.run(bg_command, shell=True)
+        # Detach into its own session (what nohup ... & did, minus the shell)
+        with open("tunnel_output.log", "ab") as log:
+            offset = os.fstat(log.fileno()).st_size
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
         
-        if result.returncode == 0:
+        if process.poll() is None or process.returncode == 0:
             print("✅ Tunnel started successfully!")
             print(f"🌐 Web access: https://vscode.dev/tunnel/{tunnel_name}")
             print(f"📱 Desktop access: Connect to tunnel '{tunnel_name}' in VSCode")
             print(f"📋 Log file: tunnel_output.log")
             
-            # Wait a moment and check status
-            time.sleep(3)
-            status_result = subprocess.run(
-                f'"{code_path}" tunnel status',
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-            
-            if status_result.returncode == 0:
-                print("📊 Tunnel Status:")
-                print(status_result.stdout)
+            # The tunnel prints its link once it's up; read that from the
+            # log rather than forking `code tunnel status`
+            tunnel_url = wait_for_tunnel_url("tunnel_output.log", offset, process)
+            if tunnel_url:
+                print(f"🔗 Tunnel link: {tunnel_url}")
+            else:
+                print("ℹ️  Tunnel link not in the log yet, check tunnel_output.log")
             
             return True
         else:
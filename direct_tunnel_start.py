@@ -4,19 +4,42 @@ Direct Tunnel Start - Bypass authentication issues
 Since you've already authorized GitHub, let's try direct tunnel start
 """
 
+import os
+import re
+import select
 import subprocess
 import time
 import json
+import functools
 from pathlib import Path
 
+CODE_PATH = str(Path.home() / ".local" / "bin" / "code")
+INSTALLER_CONFIG_FILE = Path.home() / ".config" / "vscode-server-installer" / "config.json"
+
+# What the tunnel's startup output can tell us, matched case-insensitively
+# against the raw output bytes
+DEVICE_LOGIN_RE = re.compile(rb"github\.com/login/device", re.IGNORECASE)
+TUNNEL_READY_RE = re.compile(rb"tunnel.*(?:ready|started|running)|(?:ready|started|running).*tunnel", re.IGNORECASE)
+WEB_URL_RE = re.compile(rb"open.*vscode\.dev|vscode\.dev.*open", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=4)
+def _parse_config(path, mtime_ns):
+    """Parse a JSON config file; cached per (path, mtime) so edits are picked up."""
+    return json.loads(Path(path).read_bytes())
+
+def load_installer_config():
+    """Return the VSCode Server installer config ({} if missing or unreadable)."""
+    try:
+        mtime_ns = INSTALLER_CONFIG_FILE.stat().st_mtime_ns
+        return _parse_config(str(INSTALLER_CONFIG_FILE), mtime_ns)
+    except (OSError, ValueError):
+        return {}
+
 def check_existing_auth():
     """Check if there's already valid authentication"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     try:
         result = subprocess.run(
-            f'"{code_path}" tunnel user show',
-            shell=True,
+            [CODE_PATH, "tunnel", "user", "show"],
             capture_output=True,
             text=True,
             timeout=5
@@ -36,64 +59,76 @@ def check_existing_auth():
 
 def try_direct_tunnel_start():
     """Try to start tunnel directly"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     # Get tunnel name
-    config_file = Path.home() / ".config" / "vscode-server-installer" / "config.json"
-    tunnel_name = "deer-codev"  # from your logs
-    
-    if config_file.exists():
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                tunnel_name = config.get('tunnel_name', tunnel_name)
-        except:
-            pass
+    tunnel_name = load_installer_config().get('tunnel_name') or "deer-codev"  # default from your logs
     
     print(f"🚀 Attempting to start tunnel: {tunnel_name}")
     
     # Try starting tunnel directly
-    tunnel_command = f'"{code_path}" tunnel --name "{tunnel_name}" --accept-server-license-terms'
+    tunnel_command = [CODE_PATH, "tunnel", "--name", tunnel_name, "--accept-server-license-terms"]
     
-    print(f"▶️  Command: {tunnel_command}")
+    print(f"▶️  Command: {' '.join(tunnel_command)}")
     print("🔄 Starting tunnel process...")
     
     try:
         # Start process and monitor for a short time
         process = subprocess.Popen(
             tunnel_command,
-            shell=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
+            stderr=subprocess.STDOUT
         )
         
         print(f"📋 Process PID: {process.pid}")
         print("⏳ Monitoring startup (15 seconds)...")
         
-        start_time = time.time()
         success_indicators = []
         
-        while time.time() - start_time < 15:  # Monitor for 15 seconds
-            line = process.stdout.readline()
+        # Block in select() until output arrives (or the window ends) instead
+        # of sleeping between reads; partial lines wait in buffer
+        fd = process.stdout.fileno()
+        buffer = b""
+        deadline = time.monotonic() + 15  # Monitor for 15 seconds
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             
-            if line:
-                line = line.strip()
-                print(f"📄 {line}")
-                
-                # Check for success indicators
-                if "tunnel" in line.lower() and any(word in line.lower() for word in ["ready", "started", "running"]):
-                    success_indicators.append("tunnel_ready")
-                    print("✅ Tunnel appears to be ready!")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                chunk = os.read(fd, 4096)
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                if not chunk and buffer:
+                    # EOF: a last line without a newline still counts
+                    lines, buffer = lines + [buffer], b""
                 
-                if "open" in line.lower() and "vscode.dev" in line.lower():
-                    success_indicators.append("web_url")
-                    print("✅ Web URL detected!")
+                for raw_line in lines:
+                    line = raw_line.decode("utf-8", errors="replace").strip()
+                    print(f"📄 {line}")
+                    
+                    # A device login prompt anywhere on the line wins over
+                    # any success indicator next to it
+                    if DEVICE_LOGIN_RE.search(raw_line):
+                        print("⚠️  Still asking for device authentication...")
+                        print("💡 Your previous authorization might not have been saved")
+                        return False
+                    
+                    # Check for success indicators
+                    if TUNNEL_READY_RE.search(raw_line):
+                        success_indicators.append("tunnel_ready")
+                        print("✅ Tunnel appears to be ready!")
+                    
+                    if WEB_URL_RE.search(raw_line):
+                        success_indicators.append("web_url")
+                        print("✅ Web URL detected!")
                 
-                if "github.com/login/device" in line:
-                    print("⚠️  Still asking for device authentication...")
-                    print("💡 Your previous authorization might not have been saved")
-                    return False
+                if not chunk:
+                    # EOF: the process closed its output, collect its exit
+                    # code without outlasting the monitoring window
+                    try:
+                        process.wait(timeout=max(deadline - time.monotonic(), 0))
+                    except subprocess.TimeoutExpired:
+                        break
             
             # Check if process ended
             if process.poll() is not None:
@@ -103,8 +138,6 @@ def try_direct_tunnel_start():
                 else:
                     print(f"❌ Process failed with code: {process.returncode}")
                     return False
-            
-            time.sleep(0.5)
         
         # After monitoring period
         if success_indicators:
@@ -126,8 +159,6 @@ def try_direct_tunnel_start():
 
 def manual_auth_restart():
     """Restart authentication manually"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     print("🔄 Attempting manual authentication restart...")
     
     # Clear any existing auth state
@@ -135,20 +166,20 @@ def manual_auth_restart():
     
     try:
         # Try to logout first
-        subprocess.run(f'"{code_path}" tunnel user logout', shell=True, capture_output=True)
+        subprocess.run([CODE_PATH, "tunnel", "user", "logout"], capture_output=True)
         print("✅ Logged out (or no session to logout)")
     except:
         pass
     
     # Start fresh auth
     print("🔐 Starting fresh authentication...")
-    auth_command = f'"{code_path}" tunnel user login --provider github'
+    auth_command = [CODE_PATH, "tunnel", "user", "login", "--provider", "github"]
     
-    print(f"▶️  Running: {auth_command}")
+    print(f"▶️  Running: {' '.join(auth_command)}")
     print("👉 Complete the GitHub authentication when prompted")
     
     try:
-        result = subprocess.run(auth_command, shell=True, timeout=120)  # 2 minute timeout
+        result = subprocess.run(auth_command, timeout=120)  # 2 minute timeout
         
         if result.returncode == 0:
             print("✅ Authentication completed!")
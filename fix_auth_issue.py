@@ -7,48 +7,76 @@ Uses a different approach to complete authentication properly
 import subprocess
 import time
 import os
+import re
+import select
 import signal
-import threading
 from pathlib import Path
 
+CODE_PATH = str(Path.home() / ".local" / "bin" / "code")
+
+TUNNEL_URL_RE = re.compile(rb"https://vscode\.dev/tunnel/\S+")
+TUNNEL_URL_TIMEOUT = 5     # seconds
+TUNNEL_LOG_TAIL = 8192     # bytes
+
+def open_pidfd(pid):
+    """Open a pidfd for pid (Linux 5.3+); None where the platform has none"""
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+
+def terminate_cli(process, pidfd):
+    """SIGTERM the CLI, through its pidfd when there is one"""
+    if pidfd is not None:
+        # Bound to this exact process, so a recycled PID can't be signalled
+        signal.pidfd_send_signal(pidfd, signal.SIGTERM)
+    else:
+        os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+
 def run_auth_with_timeout():
     """Run authentication with proper timeout and signal handling"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     print("🔐 Starting GitHub authentication...")
     print("📱 This will open the device flow - please complete it quickly")
     
     # Create the authentication command
-    auth_command = f'"{code_path}" tunnel user login --provider github'
+    auth_command = [CODE_PATH, "tunnel", "user", "login", "--provider", "github"]
     
-    print(f"▶️  Running: {auth_command}")
+    print(f"▶️  Running: {' '.join(auth_command)}")
     
+    pidfd = None
     try:
         # Start the process
         process = subprocess.Popen(
             auth_command,
-            shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            preexec_fn=os.setsid  # Create new process group
+            start_new_session=True  # Create new process group
         )
+        pidfd = open_pidfd(process.pid)
         
         print(f"🔄 Process started with PID: {process.pid}")
         
-        # Create a thread to read output
+        # Output is read on this thread: select() waits for the pipe to
+        # become readable and complete lines are split out of a byte buffer
+        fd = process.stdout.fileno()
         output_lines = []
         device_code = None
         auth_url = None
-        
-        def read_output():
-            nonlocal device_code, auth_url
-            while True:
-                line = process.stdout.readline()
-                if not line:
-                    break
-                
-                line = line.strip()
+        buffer = b""
+        
+        def read_output(timeout):
+            """Handle output arriving within timeout; False once the pipe hits EOF."""
+            nonlocal device_code, auth_url, buffer
+            ready, _, _ = select.select([fd], [], [], max(timeout, 0))
+            if not ready:
+                return True
+            chunk = os.read(fd, 4096)
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            if not chunk and buffer:
+                lines, buffer = [buffer], b""
+            
+            for raw_line in lines:
+                line = raw_line.decode("utf-8", errors="replace").strip()
                 if line:
                     output_lines.append(line)
                     print(f"📄 {line}")
@@ -63,23 +91,17 @@ def run_auth_with_timeout():
                     if "github.com/login/device" in line:
                         auth_url = "https://github.com/login/device"
                         print(f"🌐 Auth URL: {auth_url}")
-        
-        # Start output reading thread
-        output_thread = threading.Thread(target=read_output)
-        output_thread.daemon = True
-        output_thread.start()
+            return bool(chunk)
         
         # Wait for device code to appear
         print("⏳ Waiting for device code...")
         
-        wait_time = 0
         max_wait = 30  # 30 seconds to get device code
+        deadline = time.monotonic() + max_wait
+        output_open = True
         
-        while device_code is None and wait_time < max_wait:
-            if process.poll() is not None:
-                break
-            time.sleep(1)
-            wait_time += 1
+        while device_code is None and output_open and time.monotonic() < deadline:
+            output_open = read_output(deadline - time.monotonic())
             
         if device_code:
             print(f"\n🎯 Device Code Found: {device_code}")
@@ -90,43 +112,41 @@ def run_auth_with_timeout():
             
             input("Press Enter after completing GitHub authentication...")
             
-            # Give process a moment to receive the auth
+            # Keep showing output until the CLI exits (up to 13 seconds)
             print("⏳ Waiting for authentication to complete...")
-            time.sleep(3)
+            deadline = time.monotonic() + 13
+            while output_open and time.monotonic() < deadline:
+                output_open = read_output(deadline - time.monotonic())
             
-            # Check if process completed
-            if process.poll() is None:
-                print("🔄 Process still running, waiting...")
-                try:
-                    process.wait(timeout=10)
-                    print("✅ Process completed normally")
-                except subprocess.TimeoutExpired:
-                    print("⏰ Process timeout, terminating...")
-                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+                print("✅ Process completed normally")
+            except subprocess.TimeoutExpired:
+                print("⏰ Process timeout, terminating...")
+                terminate_cli(process, pidfd)
                     
-        else:
+        elif process.poll() is None:
             print("❌ Device code not received, terminating...")
-            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-            
-        # Wait for output thread to finish
-        output_thread.join(timeout=2)
+            terminate_cli(process, pidfd)
+        else:
+            print("❌ Device code not received")
         
         return process.returncode == 0
         
     except Exception as e:
         print(f"❌ Error during authentication: {e}")
         return False
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
 
 def verify_authentication():
     """Verify that authentication worked"""
-    code_path = Path.home() / ".local" / "bin" / "code"
-    
     print("\n🔍 Verifying authentication...")
     
     try:
         result = subprocess.run(
-            f'"{code_path}" tunnel user show',
-            shell=True,
+            [CODE_PATH, "tunnel", "user", "show"],
             capture_output=True,
             text=True,
             timeout=10
@@ -145,12 +165,28 @@ def verify_authentication():
         print(f"❌ Error verifying auth: {e}")
         return False
 
+def wait_for_tunnel_url(log_path, offset, process, timeout=TUNNEL_URL_TIMEOUT):
+    """Watch the tunnel log for its vscode.dev link; only output after offset counts"""
+    deadline = time.monotonic() + timeout
+    with open(log_path, "rb") as f:
+        while True:
+            exited = process.poll() is not None
+            size = os.fstat(f.fileno()).st_size
+            if size > offset:
+                # The link is printed near the end; don't rescan a large log
+                f.seek(max(offset, size - TUNNEL_LOG_TAIL))
+                match = TUNNEL_URL_RE.search(f.read())
+                if match:
+                    return match.group().decode(errors="replace")
+            if exited or time.monotonic() >= deadline:
+                return None
+            time.sleep(0.2)
+
 def start_tunnel_after_auth():
     """Start tunnel after successful authentication"""
     if not verify_authentication():
         return False
     
-    code_path = Path.home() / ".local" / "bin" / "code"
     tunnel_name = input("\n📝 Enter tunnel name (or press Enter for 'my-tunnel'): ").strip()
     
     if not tunnel_name:
@@ -158,28 +194,30 @@ def start_tunnel_after_auth():
     
     print(f"🚀 Starting tunnel: {tunnel_name}")
     
-    # Start tunnel in background
-    tunnel_command = f'nohup "{code_path}" tunnel --name "{tunnel_name}" --accept-server-license-terms > tunnel.log 2>&1 &'
+    # Start tunnel in background, detached into its own session
+    tunnel_command = [CODE_PATH, "tunnel", "--name", tunnel_name, "--accept-server-license-terms"]
     
     try:
-        subprocess.run(tunnel_command, shell=True, check=True)
+        with open("tunnel.log", "ab") as log:
+            offset = os.fstat(log.fileno()).st_size
+            process = subprocess.Popen(
+                tunnel_command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
         print("✅ Tunnel started in background!")
         print(f"🌐 Web access: https://vscode.dev/tunnel/{tunnel_name}")
         print(f"📋 Log file: tunnel.log")
         
-        # Wait and check status
-        time.sleep(3)
-        
-        status_result = subprocess.run(
-            f'"{code_path}" tunnel status',
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        if status_result.returncode == 0:
-            print("\n📊 Tunnel Status:")
-            print(status_result.stdout)
+        # The tunnel prints its link once it's up; read that from the log
+        # rather than forking `code tunnel status`
+        tunnel_url = wait_for_tunnel_url("tunnel.log", offset, process)
+        if tunnel_url:
+            print(f"\n🔗 Tunnel link: {tunnel_url}")
+        else:
+            print("\nℹ️  Tunnel link not in the log yet, check tunnel.log")
         
         return True
         
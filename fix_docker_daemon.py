@@ -8,7 +8,39 @@ import os
 import sys
 import subprocess
 import logging
+import select
+import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+DOCKER_START_TIMEOUT = 30  # seconds
+DOCKER_POLL_INTERVAL = 0.05
+
+# Chains Docker leaves behind, per iptables table
+DOCKER_IPTABLES_CHAINS = {
+    "nat": ["DOCKER"],
+    "filter": ["DOCKER", "DOCKER-ISOLATION-STAGE-1", "DOCKER-ISOLATION-STAGE-2"],
+}
+# Only jumped to from DOCKER-ISOLATION-STAGE-1, which the same restore
+# document flushes first, so its -X can go in the document too
+DOCKER_UNREFERENCED_CHAINS = {"DOCKER-ISOLATION-STAGE-2"}
+
+def iptables_restore_input(chains, delete=()):
+    """Build an iptables-restore document that flushes chains.
+
+    Declaring a chain creates it if it is missing, so the flush can't fail
+    on a host where Docker never ran. Chains named in delete are removed
+    in the same document.
+    """
+    lines = []
+    for table, names in chains.items():
+        lines.append(f"*{table}")
+        lines.extend(f":{name} - [0:0]" for name in names)
+        lines.extend(f"-F {name}" for name in names)
+        lines.extend(f"-X {name}" for name in names if name in delete)
+        lines.append("COMMIT")
+    return "\n".join(lines) + "\n"
 
 class DockerDaemonFixer:
     def __init__(self):
@@ -25,7 +57,7 @@ class DockerDaemonFixer:
         )
         self.logger = logging.getLogger(__name__)
 
-    def run_command(self, command, check=True, shell=True):
+    def run_command(self, command, check=True, shell=True, input=None):
         try:
             self.logger.info(f"Running: {command}")
             result = subprocess.run(
@@ -33,7 +65,8 @@ class DockerDaemonFixer:
                 shell=shell, 
                 check=check, 
                 capture_output=True, 
-                text=True
+                text=True,
+                input=input
             )
             if result.stdout:
                 self.logger.info(f"Output: {result.stdout.strip()}")
@@ -51,35 +84,91 @@ class DockerDaemonFixer:
             return False
         return True
 
+    def find_pids(self, names):
+        """PIDs of running processes with one of the given names, read from /proc"""
+        pids = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/comm') as f:
+                    if f.read().strip() in names:
+                        pids.append(int(entry))
+            except OSError:
+                continue
+        return pids
+
+    def wait_for_exit(self, pids, timeout=2):
+        """Wait for the given processes to exit; returns as soon as they have"""
+        deadline = time.monotonic() + timeout
+        pidfds = []
+        try:
+            for pid in pids:
+                try:
+                    pidfds.append(os.pidfd_open(pid))
+                except ProcessLookupError:
+                    continue  # already gone
+            # A pidfd becomes readable once its process has exited
+            pending = pidfds
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                ready, _, _ = select.select(pending, [], [], remaining)
+                pending = [fd for fd in pending if fd not in ready]
+            return True
+        except (AttributeError, OSError):
+            # No pidfd support (older kernel or Python): poll /proc instead
+            while any(os.path.exists(f'/proc/{pid}') for pid in pids):
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
+            return True
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+
     def stop_docker(self):
         """Stop Docker daemon and related services"""
         self.logger.info("Stopping Docker services...")
+        pids = self.find_pids({"dockerd", "containerd"})
         
-        # Kill existing Docker processes
-        self.run_command("pkill -f dockerd", check=False)
-        self.run_command("pkill -f containerd", check=False)
-        
-        # Stop via service
-        self.run_command("service docker stop", check=False)
+        # Kill existing Docker processes and stop via service in one shell.
+        # The [d] keeps pkill -f from matching this shell's own command line.
+        self.run_command(
+            "pkill -f '[d]ockerd'; pkill -f '[c]ontainerd'; service docker stop",
+            check=False
+        )
         
-        time.sleep(2)
+        if not self.wait_for_exit(pids):
+            self.logger.info("Docker processes still running after 2 seconds")
 
     def fix_iptables_permissions(self):
         """Fix iptables permissions and rules"""
         self.logger.info("Fixing iptables configuration...")
         
-        # Clean up existing Docker iptables rules
-        self.run_command("iptables -t nat -F DOCKER", check=False)
-        self.run_command("iptables -t nat -X DOCKER", check=False)
-        self.run_command("iptables -t filter -F DOCKER", check=False)
-        self.run_command("iptables -t filter -X DOCKER", check=False)
-        self.run_command("iptables -t filter -F DOCKER-ISOLATION-STAGE-1", check=False)
-        self.run_command("iptables -t filter -X DOCKER-ISOLATION-STAGE-1", check=False)
-        self.run_command("iptables -t filter -F DOCKER-ISOLATION-STAGE-2", check=False)
-        self.run_command("iptables -t filter -X DOCKER-ISOLATION-STAGE-2", check=False)
+        # Flush every Docker chain (and delete the unreferenced ones) in one
+        # iptables-restore run; --noflush leaves every other chain alone
+        self.run_command(
+            "iptables-restore --noflush",
+            check=False,
+            input=iptables_restore_input(DOCKER_IPTABLES_CHAINS, DOCKER_UNREFERENCED_CHAINS)
+        )
+        # Chains a built-in chain may still jump to (e.g. nat DOCKER from
+        # PREROUTING) get their own -X: inside the document a failing -X
+        # would roll back the whole table. This also removes any chain the
+        # declarations above had to create.
+        for table, names in DOCKER_IPTABLES_CHAINS.items():
+            for name in names:
+                if name not in DOCKER_UNREFERENCED_CHAINS:
+                    self.run_command(f"iptables -t {table} -X {name}", check=False)
         
         # Allow Docker to manage iptables
-        self.run_command("sysctl -w net.ipv4.ip_forward=1", check=False)
+        try:
+            with open('/proc/sys/net/ipv4/ip_forward', 'w') as f:
+                f.write('1\n')
+        except OSError as e:
+            self.logger.error(f"Failed to enable IP forwarding: {e}")
 
     def fix_docker_socket_permissions(self):
         """Fix Docker socket permissions"""
@@ -110,6 +199,18 @@ class DockerDaemonFixer:
         with open('/etc/docker/daemon.json', 'w') as f:
             json.dump(daemon_json, f, indent=2)
 
+    def docker_ping(self):
+        """Ask the daemon's API socket for /_ping; True once it answers 200"""
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1)
+                sock.connect(DOCKER_SOCKET)
+                sock.sendall(b"GET /_ping HTTP/1.0\r\nHost: docker\r\n\r\n")
+                status_line = sock.recv(1024).split(b"\r\n", 1)[0]
+        except OSError:
+            return False
+        return status_line.split(b" ")[1:2] == [b"200"]
+
     def start_docker_manually(self):
         """Start Docker daemon with custom parameters"""
         self.logger.info("Starting Docker daemon manually...")
@@ -128,13 +229,33 @@ class DockerDaemonFixer:
             proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             self.logger.info(f"Docker daemon started with PID: {proc.pid}")
             
-            # Wait for daemon to be ready
-            for i in range(30):  # Wait up to 30 seconds
-                time.sleep(1)
-                result = self.run_command("docker info", check=False)
-                if result.returncode == 0:
-                    self.logger.info("Docker daemon is ready!")
-                    return True
+            # Wait for daemon to be ready: ping its socket directly rather
+            # than running `docker info`, and watch dockerd through a pidfd
+            # so a crash ends the wait at once
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except (AttributeError, OSError):
+                pidfd = None
+            
+            try:
+                deadline = time.monotonic() + DOCKER_START_TIMEOUT
+                while time.monotonic() < deadline:
+                    if pidfd is not None:
+                        exited = bool(select.select([pidfd], [], [], DOCKER_POLL_INTERVAL)[0])
+                    else:
+                        time.sleep(DOCKER_POLL_INTERVAL)
+                        exited = proc.poll() is not None
+                    
+                    if exited:
+                        self.logger.error(f"Docker daemon exited with code {proc.wait()}")
+                        return False
+                    
+                    if self.docker_ping():
+                        self.logger.info("Docker daemon is ready!")
+                        return True
+            finally:
+                if pidfd is not None:
+                    os.close(pidfd)
                     
             self.logger.error("Docker daemon failed to start properly")
             return False
@@ -177,18 +298,24 @@ class DockerDaemonFixer:
             
         self.logger.info("Starting Docker daemon fixes...")
         
-        # Install missing dependencies
-        self.install_missing_dependencies()
-        
-        # Stop existing Docker
-        self.stop_docker()
+        # Install missing dependencies in the background: apt-get takes the
+        # longest, and only the iptables cleanup needs what it installs
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            apt = executor.submit(self.install_missing_dependencies)
+            
+            # Stop existing Docker
+            self.stop_docker()
+            
+            # Fix socket permissions
+            self.fix_docker_socket_permissions()
+            
+            # Create service config
+            self.create_docker_service_config()
+            
+            apt.result()
         
-        # Fix permissions and iptables
+        # Fix iptables (needs the iptables package from apt-get)
         self.fix_iptables_permissions()
-        self.fix_docker_socket_permissions()
-        
-        # Create service config
-        self.create_docker_service_config()
         
         # Try to start via service first
         self.logger.info("Trying to start Docker via service...")
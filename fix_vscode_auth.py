@@ -6,6 +6,9 @@ Diagnoses and fixes authentication issues with VSCode Server tunnels
 
 import sys
 import os
+import re
+import signal
+import functools
 import subprocess
 from pathlib import Path
 
@@ -14,16 +17,44 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from code_server_colab_setup import CodeServerSetup
 
+# Command lines of VSCode tunnel processes (what `pgrep -f` was given)
+TUNNEL_CMDLINE_RE = re.compile(rb"code.*tunnel")
+
+def find_tunnel_pids():
+    """PIDs of running VSCode tunnel processes, read straight from /proc."""
+    own_pid = os.getpid()
+    pids = []
+    with os.scandir('/proc') as entries:
+        for entry in entries:
+            if not entry.name.isdigit() or int(entry.name) == own_pid:
+                continue
+            try:
+                with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                    cmdline = f.read().replace(b'\0', b' ')
+            except OSError:
+                continue  # exited, or not ours to read
+            if TUNNEL_CMDLINE_RE.search(cmdline):
+                pids.append(int(entry.name))
+    return pids
+
+@functools.lru_cache(maxsize=None)
+def get_vscode_bin():
+    """VSCode CLI path from the setup config; diagnose and fix share one lookup."""
+    app = CodeServerSetup()
+    return Path(app.config.get("vscode_server.bin_path", str(Path.home() / ".local" / "bin" / "code")))
+
 def diagnose_vscode_auth_issue():
-    """Diagnose VSCode Server authentication issues."""
+    """Diagnose VSCode Server authentication issues.
+    
+    Returns True/False for the `code tunnel user show` result, or None when
+    it could not be checked.
+    """
     print("🔍 VSCode Server Authentication Diagnosis")
     print("=" * 50)
     
-    app = CodeServerSetup()
-    
     # Check 1: VSCode CLI Installation
     print("\n1. Checking VSCode CLI installation...")
-    vscode_bin = Path(app.config.get("vscode_server.bin_path", str(Path.home() / ".local" / "bin" / "code")))
+    vscode_bin = get_vscode_bin()
     if vscode_bin.exists():
         print(f"✅ VSCode CLI found: {vscode_bin}")
         try:
@@ -36,7 +67,7 @@ def diagnose_vscode_auth_issue():
             print(f"❌ Version check error: {e}")
     else:
         print(f"❌ VSCode CLI not found: {vscode_bin}")
-        return False
+        return None
     
     # Check 2: Authentication Status
     print("\n2. Checking authentication status...")
@@ -53,18 +84,16 @@ def diagnose_vscode_auth_issue():
             auth_ok = False
     except Exception as e:
         print(f"❌ Auth check failed: {e}")
-        auth_ok = False
+        auth_ok = None
     
     # Check 3: Running Processes
     print("\n3. Checking running VSCode processes...")
     try:
-        result = subprocess.run(["pgrep", "-f", "code.*tunnel"], capture_output=True, text=True)
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
+        pids = find_tunnel_pids()
+        if pids:
             print(f"✅ Found {len(pids)} VSCode tunnel process(es)")
             for pid in pids:
-                if pid:
-                    print(f"   PID: {pid}")
+                print(f"   PID: {pid}")
         else:
             print("❌ No VSCode tunnel processes found")
     except Exception as e:
@@ -86,13 +115,16 @@ def diagnose_vscode_auth_issue():
     
     return auth_ok
 
-def fix_vscode_auth():
-    """Fix VSCode Server authentication issues."""
+def fix_vscode_auth(auth_ok=None):
+    """Fix VSCode Server authentication issues.
+    
+    auth_ok is the result of an earlier diagnose_vscode_auth_issue() run;
+    when it is known, the authentication check isn't repeated.
+    """
     print("\n🔧 VSCode Server Authentication Fix")
     print("=" * 40)
     
-    app = CodeServerSetup()
-    vscode_bin = Path(app.config.get("vscode_server.bin_path", str(Path.home() / ".local" / "bin" / "code")))
+    vscode_bin = get_vscode_bin()
     
     if not vscode_bin.exists():
         print("❌ VSCode CLI not found. Please install VSCode Server first.")
@@ -101,7 +133,11 @@ def fix_vscode_auth():
     # Step 1: Stop any running tunnels
     print("\n1. Stopping existing tunnels...")
     try:
-        subprocess.run(["pkill", "-f", "code.*tunnel"], timeout=10)
+        for pid in find_tunnel_pids():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                continue
         print("✅ Stopped existing tunnel processes")
     except Exception as e:
         print(f"⚠️  Could not stop processes: {e}")
@@ -109,9 +145,12 @@ def fix_vscode_auth():
     # Step 2: Clear authentication if needed
     print("\n2. Checking authentication...")
     try:
-        result = subprocess.run([str(vscode_bin), "tunnel", "user", "show"], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
+        if auth_ok is None:
+            result = subprocess.run([str(vscode_bin), "tunnel", "user", "show"], 
+                                  capture_output=True, text=True, timeout=5)
+            auth_ok = result.returncode == 0
+        
+        if not auth_ok:
             print("❌ Not authenticated, need to login")
             
             # Choose provider
@@ -201,7 +240,7 @@ def main():
         try:
             fix_choice = input("👉 Fix authentication issues? (y/N): ").strip().lower()
             if fix_choice == 'y':
-                success = fix_vscode_auth()
+                success = fix_vscode_auth(auth_ok)
                 if success:
                     print("\n🎉 Authentication fix completed!")
                     print("💡 You can now try starting VSCode Server again")
@@ -20,6 +20,7 @@ import subprocess
 import requests
 import tarfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import tempfile
 
@@ -73,10 +74,65 @@ def create_directories():
         dir_path.mkdir(parents=True, exist_ok=True)
         print_status(f"Created directory: {dir_path}", "info")
 
-def download_vscode_cli():
-    """Download VSCode CLI with multiple fallback URLs."""
-    install_dir = Path.home() / ".local" / "lib" / "vscode-server"
+# Read size for the streamed archive (tarfile's default is 10 KiB)
+DOWNLOAD_BUFSIZE = 64 * 1024
+
+class DownloadProgress:
+    """Read-only file wrapper that prints download progress as it is read."""
+    
+    def __init__(self, raw, total_size):
+        self.raw = raw
+        self.total_size = total_size
+        self.downloaded = 0
+        self.shown = None
+    
+    def read(self, size=-1):
+        chunk = self.raw.read(size)
+        self.downloaded += len(chunk)
+        if self.total_size > 0:
+            # Redraw only when the shown value changes (at most ~1000
+            # times), not on every read
+            progress = self.downloaded * 1000 // self.total_size
+            if progress != self.shown:
+                self.shown = progress
+                print(f"\r📥 Progress: {progress / 10:.1f}%", end="", flush=True)
+        return chunk
+
+def order_by_response(urls, timeout=10):
+    """Move the first URL to answer a HEAD request with 200 to the front.
+    
+    All URLs are probed at once, so a slow or hanging mirror costs at most
+    the probe timeout instead of a full download attempt.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    futures = {
+        executor.submit(requests.head, url, timeout=timeout, allow_redirects=True): url
+        for url in urls
+    }
+    winner = None
+    try:
+        for future in as_completed(futures):
+            try:
+                if future.result().status_code == 200:
+                    winner = futures[future]
+                    break
+            except requests.RequestException:
+                continue
+    finally:
+        # Don't wait for the slower probes
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    if winner is None:
+        return urls
+    print_status(f"Fastest responding URL: {winner}", "info")
+    return [winner] + [url for url in urls if url != winner]
+
+def download_and_install_vscode_cli():
+    """Download VSCode CLI with multiple fallback URLs and install it.
     
+    The archive is extracted while it downloads instead of being saved
+    to disk first.
+    """
     # Multiple URLs to try
     urls = [
         "https://update.code.visualstudio.com/latest/cli-linux-x64/stable",
@@ -84,42 +140,121 @@ def download_vscode_cli():
         "https://github.com/microsoft/vscode/releases/latest/download/vscode-cli-linux-x64.tar.gz"
     ]
     
+    # Try the quickest mirror first; the others stay as fallbacks
+    urls = order_by_response(urls)
+    
     for i, url in enumerate(urls, 1):
         print_status(f"Trying download URL {i}/{len(urls)}: {url}", "info")
+        reader = None
         
         try:
-            response = requests.get(url, stream=True, timeout=300)
-            response.raise_for_status()
-            
-            download_path = install_dir / f"vscode-cli-attempt-{i}.tar.gz"
-            
-            with open(download_path, 'wb') as f:
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with requests.get(url, stream=True, timeout=300) as response:
+                    response.raise_for_status()
+                    # Undo any Content-Encoding, as iter_content would
+                    response.raw.decode_content = True
+                    total_size = int(response.headers.get('content-length', 0))
+                    
+                    # 'r|gz' reads the archive front to back without seeking,
+                    # so it can be extracted straight off the socket
+                    reader = DownloadProgress(response.raw, total_size)
+                    with tarfile.open(fileobj=reader, mode='r|gz', bufsize=DOWNLOAD_BUFSIZE) as tar:
+                        tar.extractall(temp_dir)
                 
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\r📥 Progress: {progress:.1f}%", end="", flush=True)
-            
-            print()  # New line after progress
-            print_status(f"Downloaded: {download_path}", "success")
-            return download_path
+                print()  # New line after progress
+                print_status(f"Downloaded and extracted: {url}", "success")
+                
+                if install_binary_from(Path(temp_dir)):
+                    return True
             
         except Exception as e:
+            if reader is not None and reader.downloaded:
+                print()  # Don't leave the message on the progress line
             print_status(f"Download failed: {e}", "error")
             continue
     
-    return None
+    return False
 
-def extract_and_find_binary(download_path):
-    """Extract archive and find the VSCode binary."""
-    install_dir = Path.home() / ".local" / "lib" / "vscode-server"
+# File names the VSCode CLI ships under
+BINARY_NAMES = {'code', 'vscode', 'code-server', 'code.exe'}
+
+def walk_files(root):
+    """Yield a DirEntry for every non-directory under root, depth first."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_files(entry.path)
+            else:
+                yield entry
+
+def install_candidate(candidate, bin_path):
+    """Install candidate as the VSCode CLI if it really is one."""
+    print_status(f"Testing candidate: {candidate.name}", "info")
+    try:
+        result = subprocess.run([str(candidate), '--version'], 
+                              capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            output = result.stdout.lower()
+            if 'code' in output or 'visual studio code' in output:
+                print_status(f"Found valid VSCode CLI: {candidate}", "success")
+                
+                # Copy to final location
+                if bin_path.exists():
+                    bin_path.unlink()
+                
+                shutil.copy2(candidate, bin_path)
+                bin_path.chmod(0o755)
+                
+                print_status(f"Installed VSCode CLI to: {bin_path}", "success")
+                return True
+    except Exception as e:
+        print_status(f"Candidate test failed: {e}", "warning")
+    return False
+
+def install_binary_from(temp_path):
+    """Find the VSCode binary in an extracted archive and install it."""
     bin_path = Path.home() / ".local" / "bin" / "code"
     
+    # Strategy 1: Look for exact names. This is a single pass over the
+    # tree; a match is tested as soon as it turns up, and the rest of the
+    # entries are kept for strategy 2 and the summary below
+    all_files = []
+    found_named = False
+    for entry in walk_files(temp_path):
+        all_files.append(entry)
+        if entry.name in BINARY_NAMES and entry.is_file():
+            found_named = True
+            if install_candidate(Path(entry.path), bin_path):
+                return True
+    
+    # Strategy 2: Look for any executable files
+    if not found_named:
+        for entry in all_files:
+            try:
+                if entry.is_file() and entry.stat().st_size > 1000:
+                    # Try to make it executable
+                    file_path = Path(entry.path)
+                    file_path.chmod(0o755)
+                    if os.access(file_path, os.X_OK) and install_candidate(file_path, bin_path):
+                        return True
+            except OSError:
+                continue
+    
+    # If no valid binary found, show detailed information
+    print_status("No valid VSCode binary found in archive", "error")
+    print_status("Archive contents summary:", "info")
+    for entry in all_files[:20]:  # Show first 20 files
+        rel_path = Path(entry.path).relative_to(temp_path)
+        is_executable = os.access(entry.path, os.X_OK)
+        size = entry.stat().st_size
+        print(f"  - {rel_path} (executable: {is_executable}, size: {size})")
+    if len(all_files) > 20:
+        print(f"  ... and {len(all_files) - 20} more files")
+    
+    return False
+
+def extract_and_find_binary(download_path):
+    """Extract archive and find the VSCode binary."""
     print_status("Extracting VSCode CLI...", "info")
     
     try:
@@ -130,77 +265,7 @@ def extract_and_find_binary(download_path):
             with tarfile.open(download_path, 'r:gz') as tar:
                 tar.extractall(temp_path)
             
-            # List all extracted files for debugging
-            print_status("Listing extracted files:", "info")
-            all_files = []
-            for root, _, files in os.walk(temp_path):
-                for file in files:
-                    file_path = Path(root) / file
-                    is_executable = os.access(file_path, os.X_OK)
-                    size = file_path.stat().st_size
-                    rel_path = file_path.relative_to(temp_path)
-                    all_files.append((str(rel_path), is_executable, size))
-                    print(f"  📄 {rel_path} (executable: {is_executable}, size: {size})")
-            
-            # Search for VSCode binary with multiple strategies
-            binary_candidates = []
-            
-            # Strategy 1: Look for exact names
-            binary_names = ['code', 'vscode', 'code-server', 'code.exe']
-            for root, _, files in os.walk(temp_path):
-                for name in binary_names:
-                    if name in files:
-                        candidate = Path(root) / name
-                        if candidate.is_file():
-                            binary_candidates.append(candidate)
-            
-            # Strategy 2: Look for any executable files
-            if not binary_candidates:
-                for root, _, files in os.walk(temp_path):
-                    for file in files:
-                        file_path = Path(root) / file
-                        if file_path.is_file() and file_path.stat().st_size > 1000:
-                            # Try to make it executable
-                            try:
-                                file_path.chmod(0o755)
-                                if os.access(file_path, os.X_OK):
-                                    binary_candidates.append(file_path)
-                            except:
-                                continue
-            
-            # Test candidates to find the real VSCode CLI
-            for candidate in binary_candidates:
-                print_status(f"Testing candidate: {candidate.name}", "info")
-                try:
-                    result = subprocess.run([str(candidate), '--version'], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        output = result.stdout.lower()
-                        if 'code' in output or 'visual studio code' in output:
-                            print_status(f"Found valid VSCode CLI: {candidate}", "success")
-                            
-                            # Copy to final location
-                            if bin_path.exists():
-                                bin_path.unlink()
-                            
-                            shutil.copy2(candidate, bin_path)
-                            bin_path.chmod(0o755)
-                            
-                            print_status(f"Installed VSCode CLI to: {bin_path}", "success")
-                            return True
-                except Exception as e:
-                    print_status(f"Candidate test failed: {e}", "warning")
-                    continue
-            
-            # If no valid binary found, show detailed information
-            print_status("No valid VSCode binary found in archive", "error")
-            print_status("Archive contents summary:", "info")
-            for file_info in all_files[:20]:  # Show first 20 files
-                print(f"  - {file_info[0]} (executable: {file_info[1]}, size: {file_info[2]})")
-            if len(all_files) > 20:
-                print(f"  ... and {len(all_files) - 20} more files")
-            
-            return False
+            return install_binary_from(temp_path)
     
     except Exception as e:
         print_status(f"Extraction failed: {e}", "error")
@@ -224,6 +289,8 @@ def try_alternative_installation():
         ["wget", "-O", "/tmp/vscode-cli.tar.gz", 
          "https://update.code.visualstudio.com/latest/cli-linux-x64/stable"]
     ]
+    # Only try the download tools that are actually installed
+    curl_commands = [cmd for cmd in curl_commands if shutil.which(cmd[0])]
     
     for cmd in curl_commands:
         try:
@@ -239,7 +306,11 @@ def try_alternative_installation():
             print_status(f"{cmd[0]} failed: {e}", "warning")
             continue
     
-    # Method 2: Try snap installation
+    # Method 2: Try snap installation (no snapd in most containers/Colab)
+    if not shutil.which("snap"):
+        print_status("snap not available, skipping", "info")
+        return False
+    
     try:
         print_status("Trying snap installation...", "info")
         result = subprocess.run(["snap", "install", "code", "--classic"], 
@@ -294,12 +365,10 @@ def main():
     create_directories()
     
     # Try to download and install
-    download_path = download_vscode_cli()
-    if download_path:
-        if extract_and_find_binary(download_path):
-            if verify_installation():
-                print_status("VSCode Server installation completed successfully!", "success")
-                return True
+    if download_and_install_vscode_cli():
+        if verify_installation():
+            print_status("VSCode Server installation completed successfully!", "success")
+            return True
     
     # Try alternative methods
     if try_alternative_installation():
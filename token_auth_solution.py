@@ -107,15 +107,22 @@ def start_tunnel_with_auth():
     print(f"🚀 Starting tunnel: {tunnel_name}")
     
     # Start tunnel
-    tunnel_command = f'"{code_path}" tunnel --name "{tunnel_name}" --accept-server-license-terms'
+    tunnel_command = [str(code_path), "tunnel", "--name", tunnel_name, "--accept-server-license-terms"]
     
-    print(f"▶️  Command: {tunnel_command}")
+    print(f"▶️  Command: {' '.join(tunnel_command)}")
     print("🔄 Starting tunnel...")
     
     try:
-        # Start in background
-        bg_command = f"nohup {tunnel_command} > tunnel_output.log 2>&1 &"
-        subprocess.run(bg_command, shell=True, check=True)
+        # Start in background, writing straight to the log file in its own
+        # session (what nohup ... & did, minus the shell)
+        with open("tunnel_output.log", "wb") as log:
+            subprocess.Popen(
+                tunnel_command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
         
         print("✅ Tunnel started in background!")
         print(f"🌐 Web access: https://vscode.dev/tunnel/{tunnel_name}")
@@ -474,19 +474,28 @@ class VSCodeServerInstaller:
         print(f"🌐 Akses melalui: https://vscode.dev/tunnel/{tunnel_name}")
         print("📱 Atau buka desktop VSCode dan connect ke tunnel")
         
-        command = f'"{code_path}" tunnel --name "{tunnel_name}" --accept-server-license-terms'
-        
-        # Start di background menggunakan nohup
-        bg_command = f"nohup {command} > {self.config_dir}/tunnel.log 2>&1 &"
-        success, stdout, stderr = self.run_command(bg_command)
+        command = [str(code_path), "tunnel", "--name", tunnel_name, "--accept-server-license-terms"]
+        log_file = self.config_dir / "tunnel.log"
+        self.logger.debug(f"Executing command: {' '.join(command)}")
         
-        if success:
-            print("✅ Tunnel berhasil dijalankan!")
-            print(f"📋 Log tersedia di: {self.config_dir}/tunnel.log")
-            return True
-        else:
-            print(f"❌ Error starting tunnel: {stderr}")
+        # Start di background: tunnel menulis log langsung ke file dan
+        # berjalan di session sendiri (pengganti nohup, tanpa shell)
+        try:
+            with open(log_file, "wb") as log:
+                subprocess.Popen(
+                    command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+        except OSError as e:
+            print(f"❌ Error starting tunnel: {e}")
             return False
+        
+        print("✅ Tunnel berhasil dijalankan!")
+        print(f"📋 Log tersedia di: {log_file}")
+        return True
     
     def stop_tunnel(self):
         """Stop VSCode Server tunnel"""